@@ -1,12 +1,28 @@
 """Base generator class."""
 
+import os
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional
 from pathlib import Path
+import numpy as np
 from pydantic import BaseModel, Field
 from .schemas import TaskPair
 
 
+# With max_workers=None a process pool is only started when every worker gets
+# at least this many tasks; below that, pool startup and pickling outweigh it
+MIN_TASKS_PER_WORKER = 16
+
+
+def worker_count(max_workers: Optional[int], num_tasks: int) -> int:
+    """Number of processes for num_tasks tasks (1 means run serially in-process)."""
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, num_tasks // MIN_TASKS_PER_WORKER)
+    return max(1, min(max_workers, num_tasks))
+
+
 class GenerationConfig(BaseModel):
     """Generation configuration."""
     num_samples: int
@@ -15,6 +31,17 @@ class GenerationConfig(BaseModel):
     random_seed: Optional[int] = None
     output_dir: Path = Path("data/questions")
     image_size: tuple[int, int] = (400, 400)
+    # zlib level for PNG output (0-9). Level 1 encodes several times faster
+    # than PIL's default of 6 for a few percent larger files; the deflate
+    # search effort grows steeply with level while the savings flatten out.
+    png_compress_level: int = Field(default=1, ge=0, le=9)
+    png_backend: str = "cv2"  # PNG encoder: "fpnge", "cv2" or "pil"
+    # Processes for generation and for writing. None uses up to os.cpu_count(),
+    # but only when every worker gets MIN_TASKS_PER_WORKER tasks; generation
+    # and writing each start their own pool, so generated images are pickled
+    # back to the parent and again to the writers
+    max_workers: Optional[int] = None
+    shard_size: Optional[int] = Field(default=None, ge=1)  # Tasks per tar shard (None = one directory per task)
 
 
 class BaseGenerator(ABC):
@@ -23,8 +50,6 @@ class BaseGenerator(ABC):
     def __init__(self, config: GenerationConfig):
         self.config = config
         if config.random_seed is not None:
-            import random
-            import numpy as np
             random.seed(config.random_seed)
             np.random.seed(config.random_seed)
     
@@ -33,12 +58,53 @@ class BaseGenerator(ABC):
         """Generate a single task. Implement this in your generator."""
         pass
     
+    def task_ids(self) -> List[str]:
+        """Task IDs for the complete dataset, in order."""
+        return [f"{self.config.domain}_{i:04d}" for i in range(self.config.num_samples)]
+    
+    def plan_tasks(self, task_ids: List[str]) -> List[Any]:
+        """
+        Choose per-task data up front in the main process.
+        
+        Override to return one entry per task ID; each non-None entry is
+        passed to generate_task_pair(task_id, plan) alongside its task, so
+        choices that must be coordinated across tasks (e.g. avoiding
+        duplicates) hold when tasks are generated in worker processes.
+        """
+        return [None] * len(task_ids)
+    
     def generate_dataset(self) -> List[TaskPair]:
-        """Generate complete dataset."""
+        """Generate complete dataset, across worker processes when max_workers allows."""
+        task_ids = self.task_ids()
+        plans = self.plan_tasks(task_ids)
+        
+        # One seed per task from the main RNG, so a seeded run produces the
+        # same tasks regardless of how many workers render them
+        seeds = [random.randrange(2**32) for _ in task_ids]
+        
+        workers = worker_count(self.config.max_workers, len(task_ids))
+        if workers <= 1:
+            results = map(self._generate_seeded_task_pair, task_ids, seeds, plans)
+            return self._collect(results)
+        
+        chunksize = max(1, len(task_ids) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._generate_seeded_task_pair, task_ids, seeds, plans, chunksize=chunksize)
+            return self._collect(results)
+    
+    def _generate_seeded_task_pair(self, task_id: str, seed: int, plan: Any = None) -> TaskPair:
+        """Reseed the RNGs, then generate one task (runs in worker processes)."""
+        random.seed(seed)
+        np.random.seed(seed)
+        if plan is None:
+            return self.generate_task_pair(task_id)
+        return self.generate_task_pair(task_id, plan)
+    
+    @staticmethod
+    def _collect(results) -> List[TaskPair]:
+        """Gather generated tasks in order, reporting progress."""
         pairs = []
-        for i in range(self.config.num_samples):
-            task_id = f"{self.config.domain}_{i:04d}"
-            pair = self.generate_task_pair(task_id)
+        for pair in results:
             pairs.append(pair)
-            print(f"  Generated: {task_id}")
+            print(f"  Generated: {pair.task_id}")
         return pairs
@@ -1,17 +1,54 @@
 """Output writer for standard format."""
 
+import io
+import os
 import shutil
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+from PIL import Image
+from .base_generator import worker_count
 from .schemas import TaskPair
 from .image_utils import ImageRenderer
+from .video_utils import CV2_AVAILABLE, cv2, np
+
+# Optional SIMD PNG encoder, several times faster than OpenCV/PIL
+import importlib.util
+
+FPNGE_AVAILABLE = importlib.util.find_spec("fpnge") is not None
+
+if FPNGE_AVAILABLE:
+    import fpnge
+else:
+    fpnge = None
+
+PNG_BACKENDS = ("fpnge", "cv2", "pil")
 
 
 class OutputWriter:
     """Writes tasks to standard folder structure."""
     
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        png_compress_level: int = 1,
+        max_workers: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        png_backend: str = "cv2"
+    ):
+        if png_backend not in PNG_BACKENDS:
+            raise ValueError(f"Unknown PNG backend: {png_backend}")
+        if png_backend == "fpnge" and not FPNGE_AVAILABLE:
+            raise ImportError("fpnge is required for png_backend='fpnge'")
+        
         self.output_dir = Path(output_dir)
+        self.png_compress_level = png_compress_level
+        # Without OpenCV the 'cv2' backend falls back to PIL
+        self.png_backend = png_backend if png_backend != "cv2" or CV2_AVAILABLE else "pil"
+        self.max_workers = max_workers
+        self.shard_size = shard_size
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
     def write_task_pair(self, task_pair: TaskPair) -> Path:
@@ -19,25 +56,147 @@ class OutputWriter:
         task_dir = self.output_dir / f"{task_pair.domain}_task" / task_pair.task_id
         task_dir.mkdir(parents=True, exist_ok=True)
         
-        # Write images
-        ImageRenderer.ensure_rgb(task_pair.first_image).save(task_dir / "first_frame.png")
-        
-        if task_pair.final_image:
-            ImageRenderer.ensure_rgb(task_pair.final_image).save(task_dir / "final_frame.png")
-        
-        # Write prompt
-        (task_dir / "prompt.txt").write_text(task_pair.prompt)
+        # Encode everything up front, then write each file with a single
+        # open/write/close sequence
+        for name, data in self._task_files(task_pair):
+            self._write_bytes(task_dir / name, data)
         
         # Write video if provided (preserve original extension)
         if task_pair.ground_truth_video and Path(task_pair.ground_truth_video).exists():
             video_src = Path(task_pair.ground_truth_video)
             video_ext = video_src.suffix  # .mp4 or .avi
-            shutil.copy(video_src, task_dir / f"ground_truth{video_ext}")
+            self._copy_file(video_src, task_dir / f"ground_truth{video_ext}")
         
         return task_dir
     
+    def write_shard(self, shard_id: int, task_pairs: List[TaskPair]) -> Path:
+        """
+        Write tasks into one WebDataset-style tar archive.
+        
+        Members are named "{task_id}.{filename}" (e.g. "shape_scaling_0000.first_frame.png")
+        so WebDataset and similar loaders group them into one sample per task.
+        """
+        shard_dir = self.output_dir / f"{task_pairs[0].domain}_task"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        shard_path = shard_dir / f"shard-{shard_id:05d}.tar"
+        
+        # Every member gets the same bare header (root-owned, 0644, shard
+        # mtime) so shards do not depend on or leak local file metadata
+        mtime = int(time.time())
+        
+        with tarfile.open(shard_path, "w") as tar:
+            for task_pair in task_pairs:
+                for name, data in self._task_files(task_pair):
+                    info = tarfile.TarInfo(f"{task_pair.task_id}.{name}")
+                    info.size = len(data)
+                    info.mtime = mtime
+                    tar.addfile(info, io.BytesIO(data))
+                
+                if task_pair.ground_truth_video and Path(task_pair.ground_truth_video).exists():
+                    video_src = Path(task_pair.ground_truth_video)
+                    info = tarfile.TarInfo(f"{task_pair.task_id}.ground_truth{video_src.suffix}")
+                    info.size = video_src.stat().st_size
+                    info.mtime = mtime
+                    with open(video_src, "rb") as video_file:
+                        tar.addfile(info, video_file)
+        
+        return shard_path
+    
     def write_dataset(self, task_pairs: List[TaskPair]) -> Path:
-        """Write all tasks to disk."""
-        for pair in task_pairs:
-            self.write_task_pair(pair)
+        """Write all tasks to disk (as tar shards if shard_size is set), in parallel worker processes."""
+        if self.shard_size:
+            shards = [
+                task_pairs[start:start + self.shard_size]
+                for start in range(0, len(task_pairs), self.shard_size)
+            ]
+            self._run_parallel(len(task_pairs), self.write_shard, range(len(shards)), shards)
+        else:
+            # Each task writes to its own directory, so tasks are independent
+            self._run_parallel(len(task_pairs), self.write_task_pair, task_pairs)
         return self.output_dir
+    
+    def _run_parallel(self, num_tasks: int, func, *iterables) -> None:
+        """Call func over the zipped iterables, using a process pool when num_tasks makes it worthwhile."""
+        jobs = list(zip(*iterables))
+        workers = min(worker_count(self.max_workers, num_tasks), len(jobs))
+        if workers <= 1:
+            for args in jobs:
+                func(*args)
+            return
+        
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(func, *zip(*jobs), chunksize=chunksize))
+    
+    def _task_files(self, task_pair: TaskPair) -> List[Tuple[str, bytes]]:
+        """Encode the images and prompt of a task as (filename, bytes) pairs."""
+        files = [("first_frame.png", self._encode_png(task_pair.first_image))]
+        if task_pair.final_image:
+            files.append(("final_frame.png", self._encode_png(task_pair.final_image)))
+        files.append(("prompt.txt", task_pair.prompt.encode("utf-8")))
+        return files
+    
+    def _encode_png(self, image: Image.Image) -> bytes:
+        """Encode image as PNG (fpnge and OpenCV are much faster than PIL)."""
+        image = ImageRenderer.ensure_rgb(image)
+        if self.png_backend == "fpnge":
+            # fpnge uses its own fixed fast compression; png_compress_level does not apply
+            return fpnge.fromPIL(image)
+        if self.png_backend == "cv2":
+            frame_bgr = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+            ok, encoded = cv2.imencode(".png", frame_bgr, [cv2.IMWRITE_PNG_COMPRESSION, self.png_compress_level])
+            if not ok:
+                raise RuntimeError(f"cv2.imencode failed to encode a {image.size[0]}x{image.size[1]} PNG")
+            return encoded.tobytes()
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", compress_level=self.png_compress_level, optimize=False)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _write_bytes(path: Path, data: bytes) -> None:
+        """Write a small file with raw os-level calls (no Python file object)."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _copy_file(src: Path, dst: Path) -> None:
+        """Copy a file and its mode in-kernel (reflink where supported), falling back to shutil."""
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            size = os.fstat(in_fd).st_size
+            
+            # copy_file_range can reflink on CoW filesystems; sendfile still
+            # avoids the userspace read/write loop
+            copiers = []
+            if hasattr(os, "copy_file_range"):
+                copiers.append(lambda count: os.copy_file_range(in_fd, out_fd, count))
+            if hasattr(os, "sendfile"):
+                copiers.append(lambda count: os.sendfile(out_fd, in_fd, None, count))
+            
+            copied_in_kernel = False
+            for copy_chunk in copiers:
+                os.lseek(in_fd, 0, os.SEEK_SET)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+                os.ftruncate(out_fd, 0)
+                remaining = size
+                try:
+                    while remaining > 0:
+                        copied = copy_chunk(remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except OSError:
+                    continue
+                if remaining == 0:
+                    copied_in_kernel = True
+                    break
+        
+        if not copied_in_kernel:
+            shutil.copyfile(src, dst)
+        # Like shutil.copy, also copy the permission bits
+        shutil.copymode(src, dst)
@@ -1,8 +1,13 @@
 """Video generation utilities - Generic framework code (DO NOT MODIFY)."""
 
+import os
+import shutil
+import subprocess
+import tempfile
+from itertools import chain
 from pathlib import Path
-from typing import List, Tuple, Optional
-from PIL import Image
+from typing import Iterable, List, Tuple, Optional, Union
+from PIL import Image, ImageChops
 
 # Check if cv2 is available
 import importlib.util
@@ -18,6 +23,37 @@ else:
     print("⚠️  Warning: opencv-python not installed. Video generation disabled.")
     print("   Install with: pip install opencv-python==4.8.1.78")
 
+# cv2.VideoWriter issues many small writes for headers and indices; stage the
+# file on tmpfs (when present) and copy it out in large blocks instead
+STAGING_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+COPY_BUFFER_SIZE = 1 << 20
+
+# Containers often mount a 64 MB /dev/shm shared by every pool worker, and
+# cv2.VideoWriter ignores write errors, so only stage when there is ample room
+STAGING_MIN_FREE = 256 << 20
+
+
+def _staging_file(suffix: str) -> Optional[Path]:
+    """Create an empty file in STAGING_DIR, or return None to write in place."""
+    if STAGING_DIR is None:
+        return None
+    try:
+        if shutil.disk_usage(STAGING_DIR).free < STAGING_MIN_FREE:
+            return None
+        fd, name = tempfile.mkstemp(suffix=suffix, dir=STAGING_DIR)
+    except OSError:
+        return None
+    os.close(fd)
+    return Path(name)
+
+# ffmpeg encoder name and pixel format for each supported FourCC
+FFMPEG_CODECS = {
+    'mp4v': ("mpeg4", "yuv420p"),
+    'XVID': ("mpeg4", "yuv420p"),
+    'MJPG': ("mjpeg", "yuvj420p"),
+    'FFV1': ("ffv1", "bgr0"),
+}
+
 
 class VideoGenerator:
     """
@@ -26,25 +62,44 @@ class VideoGenerator:
     This is a generic utility class - use it in your custom generator.
     """
     
-    def __init__(self, fps: int = 10, output_format: str = "mp4"):
+    def __init__(
+        self,
+        fps: int = 10,
+        output_format: str = "mp4",
+        backend: str = "opencv",
+        codec: Optional[str] = None
+    ):
         """
         Initialize video generator.
         
         Args:
             fps: Frames per second
             output_format: Video format - "mp4" (recommended) or "avi"
+            backend: "opencv" (cv2.VideoWriter) or "ffmpeg" (raw frames piped
+                to an ffmpeg subprocess, which encodes on its own threads)
+            codec: FourCC override - "mp4v", "XVID", "MJPG" or "FFV1" (avi only).
+                Intra-only MJPG/FFV1 skip motion search and encode much faster.
         """
         self.fps = fps
         self.output_format = output_format
+        self.backend = backend
         
-        # Use H.264 for mp4 (better compatibility) or XVID for avi
+        # mp4v for mp4 (most compatible); intra-only MJPG for avi
         if output_format == "mp4":
-            self.codec = 'mp4v'  # Most compatible mp4 codec
+            self.codec = codec or 'mp4v'  # Most compatible mp4 codec
             self.extension = '.mp4'
         else:
-            self.codec = 'XVID'
+            self.codec = codec or 'MJPG'
             self.extension = '.avi'
         
+        if self.codec not in FFMPEG_CODECS:
+            raise ValueError(f"Unsupported video codec: {self.codec}")
+        if self.codec == 'FFV1' and output_format == "mp4":
+            raise ValueError("FFV1 requires output_format='avi'")
+        if backend not in ("opencv", "ffmpeg"):
+            raise ValueError(f"Unknown video backend: {backend}")
+        if backend == "ffmpeg" and shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg executable not found on PATH")
         if not CV2_AVAILABLE:
             raise ImportError("opencv-python is required for video generation")
     
@@ -55,27 +110,37 @@ class VideoGenerator:
     
     def create_video_from_frames(
         self,
-        frames: List[Image.Image],
+        frames: Iterable[Union[Image.Image, "np.ndarray"]],
         output_path: Path,
         size: Optional[Tuple[int, int]] = None
     ) -> Path:
         """
-        Create video from PIL Image frames.
+        Create video from PIL Image or NumPy frames.
         
         Args:
-            frames: List of PIL Images
+            frames: PIL Images or HxWx3/4 uint8 RGB(A) arrays, as a list, an
+                (N, H, W, 3) array stack, or any iterable (e.g. a generator,
+                so frames can be freed as soon as they are encoded). Frames
+                are only read (via np.asarray, never np.array), so the same
+                image may be yielded repeatedly to hold it on screen
             output_path: Path to save video (extension will be corrected)
             size: Optional (width, height) tuple. If None, uses first frame size
             
         Returns:
             Path to created video file
         """
-        if not frames:
+        frames = iter(frames)
+        first_frame = next(frames, None)
+        if first_frame is None:
             raise ValueError("No frames provided")
+        frames = chain([first_frame], frames)
         
         # Get video size
         if size is None:
-            size = frames[0].size
+            if isinstance(first_frame, np.ndarray):
+                size = first_frame.shape[1::-1]
+            else:
+                size = first_frame.size
         
         width, height = size
         
@@ -84,32 +149,127 @@ class VideoGenerator:
         output_path = output_path.with_suffix(self.extension)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
+        if self.backend == "ffmpeg":
+            return self._write_with_ffmpeg(frames, output_path, tuple(size))
+        
         # Initialize video writer
         fourcc = cv2.VideoWriter_fourcc(*self.codec)
         
-        writer = cv2.VideoWriter(
-            str(output_path),
-            fourcc,
-            self.fps,
-            (width, height)
-        )
+        # Encode on tmpfs when possible, falling back to the output path if
+        # the staging file cannot be created or opened
+        writer = None
+        staging_path = _staging_file(self.extension)
+        if staging_path is not None:
+            writer = cv2.VideoWriter(str(staging_path), fourcc, self.fps, (width, height))
+            if not writer.isOpened():
+                staging_path.unlink(missing_ok=True)
+                staging_path = None
+        if staging_path is None:
+            writer = cv2.VideoWriter(str(output_path), fourcc, self.fps, (width, height))
+            if not writer.isOpened():
+                raise RuntimeError(f"cv2.VideoWriter could not open {output_path} with codec {self.codec}")
+        written_path = staging_path or output_path
         
         # Write frames
-        for frame in frames:
-            # Ensure RGB and correct size
-            if frame.size != size:
-                frame = frame.resize(size, Image.Resampling.LANCZOS)
+        size = tuple(size)
+        try:
+            try:
+                previous, frame_bgr = None, None
+                for frame in frames:
+                    # Hold phases repeat the same image object; reuse its conversion
+                    if frame is not previous:
+                        previous = frame
+                        frame_rgb = self._frame_array(frame, size)
+                        
+                        # Convert to OpenCV format (BGR) in one pass, dropping
+                        # alpha in the same step for RGBA frames
+                        conversion = cv2.COLOR_RGBA2BGR if frame_rgb.shape[2] == 4 else cv2.COLOR_RGB2BGR
+                        frame_bgr = cv2.cvtColor(frame_rgb, conversion)
+                    
+                    writer.write(frame_bgr)
+            finally:
+                writer.release()
             
-            # Convert PIL Image to OpenCV format (BGR)
-            frame_rgb = frame.convert('RGB')
-            frame_array = np.array(frame_rgb)
-            frame_bgr = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
+            if written_path.stat().st_size == 0:
+                raise RuntimeError(f"cv2.VideoWriter wrote no data to {written_path}")
             
-            writer.write(frame_bgr)
-        
-        writer.release()
+            if staging_path is not None:
+                with open(staging_path, 'rb') as src, open(output_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        finally:
+            if staging_path is not None:
+                staging_path.unlink(missing_ok=True)
         return output_path
     
+    def _write_with_ffmpeg(
+        self,
+        frames: Iterable[Union[Image.Image, "np.ndarray"]],
+        output_path: Path,
+        size: Tuple[int, int]
+    ) -> Path:
+        """Encode frames by piping raw RGB bytes to ffmpeg's stdin."""
+        width, height = size
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}", "-r", str(self.fps),
+            "-i", "-",
+        ]
+        encoder, pixel_format = FFMPEG_CODECS[self.codec]
+        command += ["-c:v", encoder, "-pix_fmt", pixel_format]
+        if self.codec == 'XVID':
+            command += ["-vtag", "xvid"]
+        elif self.codec == 'MJPG':
+            command += ["-q:v", "2"]
+        command.append(str(output_path))
+        
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20
+        )
+        try:
+            previous, frame_rgb = None, None
+            for frame in frames:
+                if frame is not previous:
+                    previous = frame
+                    frame_rgb = np.ascontiguousarray(self._frame_array(frame, size)[..., :3])
+                process.stdin.write(frame_rgb)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its error is reported below
+        except BaseException:
+            # The frame source failed: stop ffmpeg and drop the partial video
+            process.kill()
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            process.wait()
+            process.stderr.close()
+            output_path.unlink(missing_ok=True)
+            raise
+        _, stderr = process.communicate()
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+        return output_path
+    
+    @staticmethod
+    def _frame_array(frame: Union[Image.Image, "np.ndarray"], size: Tuple[int, int]) -> "np.ndarray":
+        """View a frame as an RGB or RGBA uint8 array of the given (width, height)."""
+        if isinstance(frame, np.ndarray):
+            if frame.ndim == 3 and frame.shape[2] in (3, 4) and frame.shape[1::-1] == size:
+                return frame
+            frame = Image.fromarray(frame)
+        
+        # Ensure RGB/RGBA and correct size
+        if frame.size != size:
+            frame = frame.resize(size, Image.Resampling.LANCZOS)
+        if frame.mode not in ('RGB', 'RGBA'):
+            frame = frame.convert('RGB')
+        return np.asarray(frame)
+    
     def create_crossfade_video(
         self,
         start_image: Image.Image,
@@ -137,25 +297,34 @@ class VideoGenerator:
         frames = []
         
         # Hold initial position
-        for _ in range(hold_frames):
-            frames.append(start_image.copy())
+        frames.extend([start_image] * hold_frames)
         
-        # Smooth cross-fade transition
-        start_rgba = start_image.convert('RGBA')
-        end_rgba = end_image.convert('RGBA')
+        # Smooth cross-fade transition. Convert both endpoints to RGB once;
+        # blending in RGB gives the same pixels as RGBA without a per-frame
+        # mode conversion.
+        start_rgb = start_image.convert('RGB')
+        end_rgb = end_image.convert('RGB')
         
         # Ensure same size
-        if start_rgba.size != end_rgba.size:
-            end_rgba = end_rgba.resize(start_rgba.size, Image.Resampling.LANCZOS)
+        if start_rgb.size != end_rgb.size:
+            end_rgb = end_rgb.resize(start_rgb.size, Image.Resampling.LANCZOS)
+        
+        # Only pixels inside the bounding box of the difference change, so
+        # blend that region and paste it onto a copy of the start image
+        bbox = ImageChops.difference(start_rgb, end_rgb).getbbox()
+        if bbox is not None:
+            start_region = start_rgb.crop(bbox)
+            end_region = end_rgb.crop(bbox)
         
         for i in range(transition_frames):
             alpha = i / (transition_frames - 1) if transition_frames > 1 else 1.0
-            blended = Image.blend(start_rgba, end_rgba, alpha)
-            frames.append(blended.convert('RGB'))
+            frame = start_rgb.copy()
+            if bbox is not None:
+                frame.paste(Image.blend(start_region, end_region, alpha), bbox[:2])
+            frames.append(frame)
         
         # Hold final position
-        for _ in range(hold_frames):
-            frames.append(end_image.copy())
+        frames.extend([end_image] * hold_frames)
         
         return self.create_video_from_frames(frames, output_path)
     
@@ -190,16 +359,18 @@ class VideoGenerator:
         frames = []
         
         # Hold initial position
-        for _ in range(hold_frames):
-            frames.append(start_image.copy())
+        frames.extend([start_image] * hold_frames)
         
         # Sliding transition with fade out/fade in
-        start_rgba = start_image.convert('RGBA')
-        end_rgba = end_image.convert('RGBA')
+        start_rgb = start_image.convert('RGB')
+        end_rgb = end_image.convert('RGB')
         
         # Ensure same size
-        if start_rgba.size != end_rgba.size:
-            end_rgba = end_rgba.resize(start_rgba.size, Image.Resampling.LANCZOS)
+        if start_rgb.size != end_rgb.size:
+            end_rgb = end_rgb.resize(start_rgb.size, Image.Resampling.LANCZOS)
+        
+        start_array = np.asarray(start_rgb, dtype=np.float32)
+        delta = np.asarray(end_rgb, dtype=np.float32) - start_array
         
         for i in range(transition_frames):
             # Progress through transition (0 to 1)
@@ -214,18 +385,16 @@ class VideoGenerator:
                 # Fading in: opacity goes from 0.2 to 1.0
                 opacity = 0.2 + ((progress - 0.5) * 2) * 0.8
             
-            # Blend the positions (sliding motion)
-            blended = Image.blend(start_rgba, end_rgba, progress)
+            # Blend the positions (sliding motion) and fade towards black in
+            # a single pass; equivalent to blending with a transparent image
+            # and dropping the alpha channel. Truncate the slide before the
+            # fade, as the two chained Image.blend calls did
+            faded = np.trunc(start_array + delta * progress) * opacity
             
-            # Apply opacity effect by blending with semi-transparent version
-            transparent = Image.new('RGBA', blended.size, (0, 0, 0, 0))
-            faded = Image.blend(transparent, blended, opacity)
-            
-            frames.append(faded.convert('RGB'))
+            frames.append(Image.fromarray(faded.astype(np.uint8)))
         
         # Hold final position
-        for _ in range(hold_frames):
-            frames.append(end_image.copy())
+        frames.extend([end_image] * hold_frames)
         
         return self.create_video_from_frames(frames, output_path)
     
@@ -252,14 +421,27 @@ class VideoGenerator:
         if start_frame.size != end_frame.size:
             end_frame = end_frame.resize(start_frame.size, Image.Resampling.LANCZOS)
         
-        start_frame = start_frame.convert('RGBA')
-        end_frame = end_frame.convert('RGBA')
-        
-        # Generate intermediate frames
-        for i in range(1, num_intermediate + 1):
-            alpha = i / (num_intermediate + 1)
-            blended = Image.blend(start_frame, end_frame, alpha)
-            frames.append(blended.convert('RGB'))
-        
-        frames.append(end_frame.convert('RGB'))
+        end_frame = end_frame.convert('RGB')
+        
+        # Generate intermediate frames as a linear blend on integer arrays
+        # (alpha channel is unused, so stay in RGB throughout). Only the
+        # bounding box of changed pixels is blended; the rest is copied.
+        start_array = np.asarray(start_frame.convert('RGB'))
+        end_array = np.asarray(end_frame)
+        changed = np.any(start_array != end_array, axis=2)
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        if rows.size:
+            region = np.s_[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+            start_region = start_array[region].astype(np.int32)
+            delta = end_array[region].astype(np.int32) - start_region
+        
+        steps = num_intermediate + 1
+        for i in range(1, steps):
+            blended = start_array.copy()
+            if rows.size:
+                blended[region] = start_region + delta * i // steps
+            frames.append(Image.fromarray(blended))
+        
+        frames.append(end_frame)
         return frames
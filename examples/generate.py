@@ -51,6 +51,18 @@ Examples:
         default=None,
         help="Random seed for reproducibility"
     )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=None,
+        help="Pack tasks into tar shards of this many tasks instead of one directory each"
+    )
+    parser.add_argument(
+        "--video-backend",
+        choices=["opencv", "ffmpeg"],
+        default="opencv",
+        help="Video encoder: opencv (default) or ffmpeg, which streams raw frames to an ffmpeg process"
+    )
     parser.add_argument(
         "--no-videos",
         action="store_true",
@@ -71,6 +83,8 @@ Examples:
         random_seed=args.seed,
         output_dir=Path(args.output),
         generate_videos=not args.no_videos,
+        shard_size=args.shard_size,
+        video_backend=args.video_backend,
     )
     
     # Generate tasks
@@ -78,7 +92,13 @@ Examples:
     tasks = generator.generate_dataset()
     
     # Write to disk
-    writer = OutputWriter(Path(args.output))
+    writer = OutputWriter(
+        Path(args.output),
+        png_compress_level=config.png_compress_level,
+        png_backend=config.png_backend,
+        max_workers=config.max_workers,
+        shard_size=config.shard_size,
+    )
     writer.write_dataset(tasks)
     
     print(f"✅ Done! Generated {len(tasks)} tasks in {args.output}/{config.domain}_task/")
@@ -24,6 +24,10 @@ class TaskConfig(GenerationConfig):
         - random_seed: Optional[int] # For reproducibility
         - output_dir: Path          # Where to save outputs
         - image_size: tuple[int, int] # Image dimensions
+        - png_compress_level: int   # PNG zlib level (0-9)
+        - png_backend: str          # PNG encoder ("fpnge", "cv2", "pil")
+        - max_workers: Optional[int] # Parallel generation/writer processes
+        - shard_size: Optional[int] # Tasks per tar shard
     """
     
     # ══════════════════════════════════════════════════════════════════════════
@@ -47,6 +51,11 @@ class TaskConfig(GenerationConfig):
         description="Video frame rate"
     )
     
+    video_backend: str = Field(
+        default="opencv",
+        description="Video encoder backend: 'opencv' or 'ffmpeg' (pipes raw frames to ffmpeg)"
+    )
+    
     # ══════════════════════════════════════════════════════════════════════════
     #  TASK-SPECIFIC SETTINGS
     # ══════════════════════════════════════════════════════════════════════════
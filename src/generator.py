@@ -7,12 +7,14 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 
+import functools
 import random
 import tempfile
 import math
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, List, Tuple, Any
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 
 from core import BaseGenerator, TaskPair, ImageRenderer
 from core.video_utils import VideoGenerator
@@ -20,6 +22,116 @@ from .config import TaskConfig
 from .prompts import get_prompt
 
 
+# Shape definitions - expanded set for more variety
+BASE_SHAPES = (
+    "square", "triangle", "circle", "diamond", "pentagon", "hexagon",
+    "rectangle", "oval", "star", "heart", "cross", "arrow", "trapezoid",
+    "rhombus", "octagon", "crescent", "plus", "minus", "L_shape", "T_shape"
+)
+
+# Single color for all shapes (since we're only doing scaling)
+SHAPE_COLOR = (70, 130, 180)  # Blue
+
+# Outline color and stroke width shared by every shape
+OUTLINE_COLOR = (0, 0, 0)
+OUTLINE_WIDTH = 2
+
+# Scaling factors - expanded set with more granular scaling options
+SCALE_FACTORS = (
+    0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95,  # Shrinking
+    1.05, 1.1, 1.15, 1.2, 1.25, 1.3, 1.35, 1.4, 1.45, 1.5, 1.55, 1.6, 1.65, 1.7, 1.75, 1.8, 1.85, 1.9, 1.95, 2.0, 2.1, 2.2  # Growing
+)
+
+# Unit-circle vertices for regular polygons (pentagon starts from the top)
+UNIT_POLYGONS = {
+    "pentagon": np.stack([np.cos(np.arange(5) * 2 * math.pi / 5 - math.pi/2), np.sin(np.arange(5) * 2 * math.pi / 5 - math.pi/2)], axis=1),
+    "hexagon": np.stack([np.cos(np.arange(6) * 2 * math.pi / 6), np.sin(np.arange(6) * 2 * math.pi / 6)], axis=1),
+    "octagon": np.stack([np.cos(np.arange(8) * 2 * math.pi / 8), np.sin(np.arange(8) * 2 * math.pi / 8)], axis=1),
+}
+
+# Unit vertices of the 5 star points, shape (5, 3, 2): outer, left inner,
+# right inner point of each triangle; STAR_RADII scales outer vs inner
+_star_angles = np.array([
+    [i * 2 * math.pi / 5 - math.pi/2, (i * 2 + 1) * math.pi / 5 - math.pi/2, (i * 2 - 1) * math.pi / 5 - math.pi/2]
+    for i in range(5)
+])
+UNIT_STAR = np.stack([np.cos(_star_angles), np.sin(_star_angles)], axis=2)
+STAR_RADII = np.array([1.0, 0.4, 0.4])[:, None]
+
+
+@functools.lru_cache(maxsize=512)
+def _polygon_points(shape: str, half_size: int, x: int, y: int) -> Tuple[float, ...]:
+    """Flat vertex list of a regular polygon, cached since the same shapes recur every frame."""
+    return tuple((UNIT_POLYGONS[shape] * half_size + (x, y)).ravel().tolist())
+
+
+@functools.lru_cache(maxsize=512)
+def _star_triangles(half_size: int, x: int, y: int) -> Tuple[Tuple[float, ...], ...]:
+    """Flat vertex lists of the 5 star triangles (outer point + two inner points), cached."""
+    points = UNIT_STAR * (half_size * STAR_RADII) + (x, y)
+    return tuple(tuple(triangle.ravel().tolist()) for triangle in points)
+
+
+@functools.lru_cache(maxsize=256)
+def _crescent_masks(half_size: int) -> Tuple[Image.Image, Image.Image]:
+    """Fill and outline masks of a crescent (large disk minus an offset smaller disk), cached per size."""
+    box = [0, 0, 2*half_size, 2*half_size]
+    offset = half_size // 3
+    smaller_radius = int(half_size * 0.7)
+    inner_box = [half_size-smaller_radius+offset, half_size-smaller_radius,
+                 half_size+smaller_radius+offset, half_size+smaller_radius]
+    
+    def ellipse_mask(bbox, **kwargs) -> Image.Image:
+        mask = Image.new("L", (2*half_size + 1, 2*half_size + 1), 0)
+        ImageDraw.Draw(mask).ellipse(bbox, **kwargs)
+        return mask
+    
+    outer_disk = ellipse_mask(box, fill=255)
+    inner_disk = ellipse_mask(inner_box, fill=255)
+    fill = ImageChops.subtract(outer_disk, inner_disk)
+    
+    # Outer rim outside the bite, plus the bite's rim inside the disk
+    outline = ImageChops.lighter(
+        ImageChops.subtract(ellipse_mask(box, outline=255, width=OUTLINE_WIDTH), inner_disk),
+        ImageChops.multiply(ellipse_mask(inner_box, outline=255, width=OUTLINE_WIDTH), outer_disk)
+    )
+    # Binary masks stamp much faster than "L" masks, which blend per pixel
+    return fill.convert("1", dither=Image.Dither.NONE), outline.convert("1", dither=Image.Dither.NONE)
+
+
+@functools.lru_cache(maxsize=256)
+def _heart_masks(half_size: int) -> Tuple[Image.Image, Image.Image]:
+    """Fill and outline masks of a heart (two circles over a triangle), cached per size."""
+    circle_radius = int(half_size * 0.4)
+    left_center_x = half_size - int(half_size * 0.3)
+    right_center_x = half_size + int(half_size * 0.3)
+    circle_center_y = half_size - int(half_size * 0.2)
+    circles = [
+        [left_center_x-circle_radius, circle_center_y-circle_radius,
+         left_center_x+circle_radius, circle_center_y+circle_radius],
+        [right_center_x-circle_radius, circle_center_y-circle_radius,
+         right_center_x+circle_radius, circle_center_y+circle_radius],
+    ]
+    triangle_points = [
+        (half_size, 2*half_size),  # bottom point
+        (left_center_x - circle_radius//2, circle_center_y),  # left
+        (right_center_x + circle_radius//2, circle_center_y)   # right
+    ]
+    
+    fill = Image.new("L", (2*half_size + 1, 2*half_size + 1), 0)
+    draw = ImageDraw.Draw(fill)
+    for circle in circles:
+        draw.ellipse(circle, fill=255, outline=255)
+    draw.polygon(triangle_points, fill=255, outline=255)
+    
+    outline = Image.new("L", fill.size, 0)
+    draw = ImageDraw.Draw(outline)
+    for circle in circles:
+        draw.ellipse(circle, outline=255, width=OUTLINE_WIDTH)
+    draw.polygon(triangle_points, outline=255, width=OUTLINE_WIDTH)
+    return fill.convert("1", dither=Image.Dither.NONE), outline.convert("1", dither=Image.Dither.NONE)
+
+
 class TaskGenerator(BaseGenerator):
     """
     Shape matching task generator.
@@ -35,32 +147,100 @@ class TaskGenerator(BaseGenerator):
         # Initialize video generator if enabled
         self.video_generator = None
         if config.generate_videos and VideoGenerator.is_available():
-            self.video_generator = VideoGenerator(fps=config.video_fps, output_format="mp4")
+            self.video_generator = VideoGenerator(
+                fps=config.video_fps,
+                output_format="mp4",
+                backend=config.video_backend
+            )
+            
+            # Resolve and create the scratch directory for videos once
+            self.video_dir = Path(tempfile.gettempdir()) / f"{config.domain}_videos"
+            self.video_dir.mkdir(parents=True, exist_ok=True)
         
-        # Shape definitions - expanded set for more variety
-        self.base_shapes = [
-            "square", "triangle", "circle", "diamond", "pentagon", "hexagon",
-            "rectangle", "oval", "star", "heart", "cross", "arrow", "trapezoid",
-            "rhombus", "octagon", "crescent", "plus", "minus", "L_shape", "T_shape"
-        ]
+        self.base_shapes = BASE_SHAPES
+        self.shape_color = SHAPE_COLOR
+        self.scale_factors = SCALE_FACTORS
         
-        # Single color for all shapes (since we're only doing scaling)
-        self.shape_color = (70, 130, 180)  # Blue
+        # Layout positions, fixed for a given config
+        # A    →    B
+        # C    →    ? / D
+        width, height = config.image_size
+        margin = config.margin
+        shape_size = config.shape_size
+        self.positions = {
+            "A": (margin + shape_size//2, height//4),
+            "arrow1": (width//2, height//4),
+            "B": (width - margin - shape_size//2, height//4),
+            "C": (margin + shape_size//2, 3*height//4),
+            "arrow2": (width//2, 3*height//4),
+            "D": (width - margin - shape_size//2, 3*height//4)
+        }
         
-        # Scaling factors - expanded set with more granular scaling options
-        self.scale_factors = [
-            0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95,  # Shrinking
-            1.05, 1.1, 1.15, 1.2, 1.25, 1.3, 1.35, 1.4, 1.45, 1.5, 1.55, 1.6, 1.65, 1.7, 1.75, 1.8, 1.85, 1.9, 1.95, 2.0, 2.1, 2.2  # Growing
-        ]
+        # Arrow template relative to its center; drawing just translates it
+        half_length = config.arrow_length // 2
+        self._arrow_shaft = (-half_length, half_length - 10)
+        self._arrow_head = ((half_length, 0), (half_length - 15, -8), (half_length - 15, 8))
+        
+        # Shape name -> drawing method, each taking (draw, x, y, half_size, color)
+        self._shape_handlers = {
+            "square": self._draw_square,
+            "circle": self._draw_circle,
+            "triangle": self._draw_triangle,
+            "diamond": self._draw_diamond,
+            "pentagon": functools.partial(self._draw_regular_polygon, "pentagon"),
+            "hexagon": functools.partial(self._draw_regular_polygon, "hexagon"),
+            "octagon": functools.partial(self._draw_regular_polygon, "octagon"),
+            "rectangle": self._draw_rectangle,
+            "oval": self._draw_oval,
+            "star": self._draw_star,
+            "heart": self._draw_heart,
+            "cross": self._draw_cross,
+            "arrow": self._draw_arrow_shape,
+            "trapezoid": self._draw_trapezoid,
+            "rhombus": self._draw_rhombus,
+            "crescent": self._draw_crescent,
+            "plus": self._draw_plus,
+            "minus": self._draw_minus,
+            "L_shape": self._draw_l_shape,
+            "T_shape": self._draw_t_shape,
+        }
         
-        # Track generated combinations to prevent duplicates
-        self.generated_combinations = set()
+        # Bounds-limited maximum shape size at each shape anchor
+        self._max_size_at = {
+            self.positions[label]: self._get_max_shape_size_for_position(*self.positions[label])
+            for label in ("A", "B", "C", "D")
+        }
+        
+        # Every unique (shape_a, shape_c, scale_factor) combination, shuffled
+        # once; tasks pop from the end so duplicates cannot occur until the
+        # pool is exhausted
+        self._combo_pool = self._build_combo_pool()
+        
+        # Blank image with both arrows, identical for every task
+        self._arrows_background = self._render_arrows_background()
+        
+        # Most recent (task key, layout image), see _render_layout
+        self._layout_cache = None
+        
+        # "?" glyph mask and centering offset, rendered on first use
+        self._question_mark_glyph = None
+        self._question_mark_offset = (0, 0)
     
-    def generate_task_pair(self, task_id: str) -> TaskPair:
+    def plan_tasks(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Choose every task's combination in the main process.
+        
+        Each task's data travels to its worker with the task itself, so
+        duplicate prevention still holds when tasks are rendered in workers.
+        """
+        return [self._generate_task_data() for _ in task_ids]
+    
+    def generate_task_pair(self, task_id: str, task_data: Optional[Dict[str, Any]] = None) -> TaskPair:
         """Generate one shape matching task pair."""
         
-        # Generate task data
-        task_data = self._generate_task_data()
+        # Generate task data (unless plan_tasks already chose it)
+        if task_data is None:
+            task_data = self._generate_task_data()
         
         # Render images
         first_image = self._render_initial_state(task_data)
@@ -89,55 +269,39 @@ class TaskGenerator(BaseGenerator):
     
     def _generate_task_data(self) -> Dict[str, Any]:
         """Generate scaling transformation task data with duplicate prevention."""
-        
-        # Calculate total possible unique combinations
-        num_shapes = len(self.base_shapes)
-        num_scale_factors = len(self.scale_factors)
-        max_unique_combinations = num_shapes * (num_shapes - 1) * num_scale_factors
-        
-        # If we haven't exhausted all combinations, ensure uniqueness
-        if len(self.generated_combinations) < max_unique_combinations:
-            max_attempts = 1000  # Increase attempts for better coverage
-            for attempt in range(max_attempts):
-                # Select two different shapes for the analogy
-                shape_a, shape_c = random.sample(self.base_shapes, 2)
-                scale_factor = random.choice(self.scale_factors)
-                
-                # Create a unique identifier for this combination
-                combination_key = (shape_a, shape_c, scale_factor)
-                
-                # Check if this combination has been used before
-                if combination_key not in self.generated_combinations:
-                    self.generated_combinations.add(combination_key)
-                    return self._generate_scaling_task(shape_a, shape_c, scale_factor)
-            
-            # If we still can't find a unique combination after many attempts,
-            # generate all remaining combinations systematically
-            return self._generate_systematic_unique_combination()
-        
-        # If we've exhausted unique combinations, allow duplicates but warn
-        if len(self.generated_combinations) == max_unique_combinations:
+        if not self._combo_pool:
+            # All unique combinations used; start a fresh shuffled round
+            max_unique_combinations = len(self.base_shapes) * (len(self.base_shapes) - 1) * len(self.scale_factors)
             print(f"⚠️  Warning: Generated all {max_unique_combinations} unique combinations. Allowing duplicates for remaining tasks.")
+            self._combo_pool = self._build_combo_pool()
         
-        shape_a, shape_c = random.sample(self.base_shapes, 2)
-        scale_factor = random.choice(self.scale_factors)
+        shape_a, shape_c, scale_factor = self._combo_pool.pop()
         return self._generate_scaling_task(shape_a, shape_c, scale_factor)
     
-    def _generate_systematic_unique_combination(self) -> Dict[str, Any]:
-        """Generate a unique combination systematically when random selection fails."""
-        # Generate all possible combinations and find one not yet used
-        for shape_a in self.base_shapes:
-            for shape_c in self.base_shapes:
-                if shape_a == shape_c:
-                    continue
-                for scale_factor in self.scale_factors:
-                    combination_key = (shape_a, shape_c, scale_factor)
-                    if combination_key not in self.generated_combinations:
-                        self.generated_combinations.add(combination_key)
-                        return self._generate_scaling_task(shape_a, shape_c, scale_factor)
-        
-        # This should never happen if our math is correct
-        raise RuntimeError("Failed to generate unique combination - this should not happen!")
+    def _build_combo_pool(self) -> List[Tuple[str, str, float]]:
+        """List all unique combinations of two different shapes and a scale factor, shuffled."""
+        pool = [
+            (shape_a, shape_c, scale_factor)
+            for shape_a in self.base_shapes
+            for shape_c in self.base_shapes
+            if shape_a != shape_c
+            for scale_factor in self.scale_factors
+        ]
+        random.shuffle(pool)
+        return pool
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle state for worker processes, which render pre-chosen task data and need no pool."""
+        state = self.__dict__.copy()
+        state["_combo_pool"] = []
+        state["_layout_cache"] = None
+        state["_arrows_background"] = None  # Redrawn by __setstate__
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore pickled state, redrawing the arrow background locally."""
+        self.__dict__.update(state)
+        self._arrows_background = self._render_arrows_background()
     
     def _generate_scaling_task(self, shape_a: str, shape_c: str, scale_factor: float) -> Dict[str, Any]:
         """Generate a scaling transformation task."""
@@ -157,66 +321,52 @@ class TaskGenerator(BaseGenerator):
     #  IMAGE RENDERING
     # ══════════════════════════════════════════════════════════════════════════
     
-    def _render_initial_state(self, task_data: Dict[str, Any]) -> Image.Image:
-        """Render the initial state with A:B :: C:? layout."""
+    def _render_arrows_background(self) -> Image.Image:
+        """Render a blank image with both transformation arrows."""
         img = self.renderer.create_blank_image()
         draw = ImageDraw.Draw(img)
+        self._draw_arrow(draw, self.positions["arrow1"])
+        self._draw_arrow(draw, self.positions["arrow2"])
+        return img
+    
+    def _render_layout(self, task_data: Dict[str, Any]) -> Image.Image:
+        """Render the A:B :: C layout shared by every image of a task (returns a copy)."""
+        key = (task_data["transformation_type"], task_data["shape_a"], task_data["shape_b"],
+               task_data["shape_c"], task_data["scale_factor"])
+        
+        # The initial, final and morph frames of one task all start from the
+        # same layout; keep the most recent one so it is drawn only once
+        if self._layout_cache is None or self._layout_cache[0] != key:
+            img = self._arrows_background.copy()
+            draw = ImageDraw.Draw(img)
+            
+            shape_size = self.config.shape_size
+            positions = self.positions
+            
+            # Draw shapes (the arrows are already on the background)
+            self._draw_shape_at_position(draw, task_data["shape_a"], positions["A"], shape_size, task_data)
+            self._draw_transformed_shape_at_position(draw, task_data["shape_b"], positions["B"], shape_size, task_data, "B")
+            self._draw_shape_at_position(draw, task_data["shape_c"], positions["C"], shape_size, task_data)
+            
+            self._layout_cache = (key, img)
         
-        width, height = self.config.image_size
-        margin = self.config.margin
-        shape_size = self.config.shape_size
-        
-        # Layout positions
-        # A    →    B
-        # C    →    ?
-        
-        positions = {
-            "A": (margin + shape_size//2, height//4),
-            "arrow1": (width//2, height//4),
-            "B": (width - margin - shape_size//2, height//4),
-            "C": (margin + shape_size//2, 3*height//4),
-            "arrow2": (width//2, 3*height//4),
-            "question": (width - margin - shape_size//2, 3*height//4)
-        }
-        
-        # Draw shapes and arrows
-        self._draw_shape_at_position(draw, task_data["shape_a"], positions["A"], shape_size, task_data)
-        self._draw_arrow(draw, positions["arrow1"])
-        self._draw_transformed_shape_at_position(draw, task_data["shape_b"], positions["B"], shape_size, task_data, "B")
+        return self._layout_cache[1].copy()
+    
+    def _render_initial_state(self, task_data: Dict[str, Any]) -> Image.Image:
+        """Render the initial state with A:B :: C:? layout."""
+        img = self._render_layout(task_data)
+        draw = ImageDraw.Draw(img)
         
-        self._draw_shape_at_position(draw, task_data["shape_c"], positions["C"], shape_size, task_data)
-        self._draw_arrow(draw, positions["arrow2"])
-        self._draw_question_mark(draw, positions["question"])
+        self._draw_question_mark(draw, self.positions["D"])
         
         return img
     
     def _render_final_state(self, task_data: Dict[str, Any]) -> Image.Image:
         """Render the final state with the answer revealed."""
-        img = self.renderer.create_blank_image()
+        img = self._render_layout(task_data)
         draw = ImageDraw.Draw(img)
         
-        width, height = self.config.image_size
-        margin = self.config.margin
-        shape_size = self.config.shape_size
-        
-        # Same layout as initial state
-        positions = {
-            "A": (margin + shape_size//2, height//4),
-            "arrow1": (width//2, height//4),
-            "B": (width - margin - shape_size//2, height//4),
-            "C": (margin + shape_size//2, 3*height//4),
-            "arrow2": (width//2, 3*height//4),
-            "D": (width - margin - shape_size//2, 3*height//4)
-        }
-        
-        # Draw shapes and arrows
-        self._draw_shape_at_position(draw, task_data["shape_a"], positions["A"], shape_size, task_data)
-        self._draw_arrow(draw, positions["arrow1"])
-        self._draw_transformed_shape_at_position(draw, task_data["shape_b"], positions["B"], shape_size, task_data, "B")
-        
-        self._draw_shape_at_position(draw, task_data["shape_c"], positions["C"], shape_size, task_data)
-        self._draw_arrow(draw, positions["arrow2"])
-        self._draw_transformed_shape_at_position(draw, task_data["shape_d"], positions["D"], shape_size, task_data, "D")
+        self._draw_transformed_shape_at_position(draw, task_data["shape_d"], self.positions["D"], self.config.shape_size, task_data, "D")
         
         return img
     
@@ -240,7 +390,9 @@ class TaskGenerator(BaseGenerator):
         if task_data["transformation_type"] == "scaling" and shape_label in ["B", "D"]:
             scaled_size = int(size * task_data["scale_factor"])
             # Ensure the scaled shape fits within bounds with margin
-            max_allowed_size = self._get_max_shape_size_for_position(x, y)
+            max_allowed_size = self._max_size_at.get(position)
+            if max_allowed_size is None:
+                max_allowed_size = self._get_max_shape_size_for_position(x, y)
             size = min(scaled_size, max_allowed_size)
         
         self._draw_base_shape(draw, shape, x, y, size, color)
@@ -267,206 +419,158 @@ class TaskGenerator(BaseGenerator):
     
     def _draw_base_shape(self, draw: ImageDraw.Draw, shape: str, x: int, y: int, size: int, color: Tuple[int, int, int]):
         """Draw a basic geometric shape."""
-        half_size = size // 2
-        
-        if shape == "square":
-            draw.rectangle([x-half_size, y-half_size, x+half_size, y+half_size], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "circle":
-            draw.ellipse([x-half_size, y-half_size, x+half_size, y+half_size], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "triangle":
-            points = [
-                (x, y-half_size),  # top
-                (x-half_size, y+half_size),  # bottom left
-                (x+half_size, y+half_size)   # bottom right
-            ]
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "diamond":
-            points = [
-                (x, y-half_size),  # top
-                (x+half_size, y),  # right
-                (x, y+half_size),  # bottom
-                (x-half_size, y)   # left
-            ]
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "pentagon":
-            points = []
-            for i in range(5):
-                angle = i * 2 * math.pi / 5 - math.pi/2  # Start from top
-                px = x + half_size * math.cos(angle)
-                py = y + half_size * math.sin(angle)
-                points.append((px, py))
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "hexagon":
-            points = []
-            for i in range(6):
-                angle = i * 2 * math.pi / 6
-                px = x + half_size * math.cos(angle)
-                py = y + half_size * math.sin(angle)
-                points.append((px, py))
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "rectangle":
-            # Rectangle (wider than tall)
-            width_factor = 1.4
-            rect_width = int(half_size * width_factor)
-            rect_height = int(half_size * 0.7)
-            draw.rectangle([x-rect_width, y-rect_height, x+rect_width, y+rect_height], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "oval":
-            # Oval (wider than tall)
-            width_factor = 1.4
-            oval_width = int(half_size * width_factor)
-            oval_height = int(half_size * 0.7)
-            draw.ellipse([x-oval_width, y-oval_height, x+oval_width, y+oval_height], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "star":
-            # 5-pointed star - draw as separate triangular segments to avoid extra lines
-            outer_radius = half_size
-            inner_radius = half_size * 0.4
-            
-            # Draw the star as 5 separate triangular segments
-            for i in range(5):
-                # Calculate angles for this star point
-                outer_angle = i * 2 * math.pi / 5 - math.pi/2  # Outer point
-                inner_angle1 = (i * 2 + 1) * math.pi / 5 - math.pi/2  # Left inner point
-                inner_angle2 = (i * 2 - 1) * math.pi / 5 - math.pi/2  # Right inner point
-                
-                # Calculate coordinates
-                outer_x = x + outer_radius * math.cos(outer_angle)
-                outer_y = y + outer_radius * math.sin(outer_angle)
-                inner_x1 = x + inner_radius * math.cos(inner_angle1)
-                inner_y1 = y + inner_radius * math.sin(inner_angle1)
-                inner_x2 = x + inner_radius * math.cos(inner_angle2)
-                inner_y2 = y + inner_radius * math.sin(inner_angle2)
-                
-                # Draw triangle for this star point
-                triangle_points = [(outer_x, outer_y), (inner_x1, inner_y1), (inner_x2, inner_y2)]
-                draw.polygon(triangle_points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "heart":
-            # Simple heart shape using circles and triangle
-            # Two circles for the top
-            circle_radius = int(half_size * 0.4)
-            left_center_x = x - int(half_size * 0.3)
-            right_center_x = x + int(half_size * 0.3)
-            circle_center_y = y - int(half_size * 0.2)
-            
-            # Draw the two top circles
-            draw.ellipse([left_center_x-circle_radius, circle_center_y-circle_radius,
-                         left_center_x+circle_radius, circle_center_y+circle_radius], fill=color, outline=color)
-            draw.ellipse([right_center_x-circle_radius, circle_center_y-circle_radius,
-                         right_center_x+circle_radius, circle_center_y+circle_radius], fill=color, outline=color)
-            
-            # Triangle for the bottom part
-            triangle_points = [
-                (x, y + half_size),  # bottom point
-                (left_center_x - circle_radius//2, circle_center_y),  # left
-                (right_center_x + circle_radius//2, circle_center_y)   # right
-            ]
-            draw.polygon(triangle_points, fill=color, outline=color)
-            
-            # Draw outline
-            draw.ellipse([left_center_x-circle_radius, circle_center_y-circle_radius,
-                         left_center_x+circle_radius, circle_center_y+circle_radius], outline=(0,0,0), width=2)
-            draw.ellipse([right_center_x-circle_radius, circle_center_y-circle_radius,
-                         right_center_x+circle_radius, circle_center_y+circle_radius], outline=(0,0,0), width=2)
-            draw.polygon(triangle_points, outline=(0,0,0), width=2)
-        
-        elif shape == "cross":
-            # Cross shape
-            thickness = half_size // 4
-            # Vertical bar
-            draw.rectangle([x-thickness, y-half_size, x+thickness, y+half_size], fill=color, outline=(0,0,0), width=2)
-            # Horizontal bar
-            draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "arrow":
-            # Arrow pointing right
-            points = [
-                (x-half_size, y-half_size//2),  # left top
-                (x, y-half_size//2),            # middle top
-                (x, y-half_size),               # tip top
-                (x+half_size, y),               # tip point
-                (x, y+half_size),               # tip bottom
-                (x, y+half_size//2),            # middle bottom
-                (x-half_size, y+half_size//2)   # left bottom
-            ]
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "trapezoid":
-            # Trapezoid (wider at bottom)
-            top_width = half_size // 2
-            points = [
-                (x-top_width, y-half_size),     # top left
-                (x+top_width, y-half_size),     # top right
-                (x+half_size, y+half_size),     # bottom right
-                (x-half_size, y+half_size)      # bottom left
-            ]
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "rhombus":
-            # Rhombus (diamond rotated)
-            points = [
-                (x, y-half_size),               # top
-                (x+half_size*0.7, y),           # right
-                (x, y+half_size),               # bottom
-                (x-half_size*0.7, y)            # left
-            ]
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "octagon":
-            # Regular octagon
-            points = []
-            for i in range(8):
-                angle = i * 2 * math.pi / 8
-                px = x + half_size * math.cos(angle)
-                py = y + half_size * math.sin(angle)
-                points.append((px, py))
-            draw.polygon(points, fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "crescent":
-            # Crescent moon shape (two overlapping circles)
-            # Draw larger circle
-            draw.ellipse([x-half_size, y-half_size, x+half_size, y+half_size], fill=color, outline=(0,0,0), width=2)
-            # Draw smaller circle to create crescent (using background color)
-            offset = half_size // 3
-            smaller_radius = int(half_size * 0.7)
-            draw.ellipse([x-smaller_radius+offset, y-smaller_radius, x+smaller_radius+offset, y+smaller_radius],
-                        fill=(255,255,255), outline=(0,0,0), width=2)
-        
-        elif shape == "plus":
-            # Plus sign (thicker cross)
-            thickness = half_size // 3
-            # Vertical bar
-            draw.rectangle([x-thickness, y-half_size, x+thickness, y+half_size], fill=color, outline=(0,0,0), width=2)
-            # Horizontal bar
-            draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "minus":
-            # Minus sign (horizontal bar)
-            thickness = half_size // 4
-            draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "L_shape":
-            # L shape
-            thickness = half_size // 3
-            # Vertical part
-            draw.rectangle([x-half_size, y-half_size, x-half_size+thickness, y+half_size], fill=color, outline=(0,0,0), width=2)
-            # Horizontal part
-            draw.rectangle([x-half_size, y+half_size-thickness, x+half_size, y+half_size], fill=color, outline=(0,0,0), width=2)
-        
-        elif shape == "T_shape":
-            # T shape
-            thickness = half_size // 3
-            # Horizontal top part
-            draw.rectangle([x-half_size, y-half_size, x+half_size, y-half_size+thickness], fill=color, outline=(0,0,0), width=2)
-            # Vertical part
-            draw.rectangle([x-thickness//2, y-half_size, x+thickness//2, y+half_size], fill=color, outline=(0,0,0), width=2)
+        handler = self._shape_handlers.get(shape)
+        if handler is not None:
+            handler(draw, x, y, size // 2, color)
+    
+    def _draw_square(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a square."""
+        draw.rectangle([x-half_size, y-half_size, x+half_size, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_circle(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a circle."""
+        draw.ellipse([x-half_size, y-half_size, x+half_size, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_triangle(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a triangle."""
+        points = [
+            (x, y-half_size),  # top
+            (x-half_size, y+half_size),  # bottom left
+            (x+half_size, y+half_size)   # bottom right
+        ]
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_diamond(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a diamond."""
+        points = [
+            (x, y-half_size),  # top
+            (x+half_size, y),  # right
+            (x, y+half_size),  # bottom
+            (x-half_size, y)   # left
+        ]
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_regular_polygon(self, shape: str, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a regular pentagon, hexagon or octagon."""
+        points = _polygon_points(shape, half_size, x, y)
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_rectangle(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a rectangle."""
+        # Rectangle (wider than tall)
+        width_factor = 1.4
+        rect_width = int(half_size * width_factor)
+        rect_height = int(half_size * 0.7)
+        draw.rectangle([x-rect_width, y-rect_height, x+rect_width, y+rect_height], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_oval(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw an oval."""
+        # Oval (wider than tall)
+        width_factor = 1.4
+        oval_width = int(half_size * width_factor)
+        oval_height = int(half_size * 0.7)
+        draw.ellipse([x-oval_width, y-oval_height, x+oval_width, y+oval_height], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_star(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a star."""
+        # 5-pointed star - draw as separate triangular segments to avoid extra lines
+        for triangle_points in _star_triangles(half_size, x, y):
+            draw.polygon(triangle_points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_heart(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a heart."""
+        # Simple heart shape using circles and triangle, stamped
+        # through cached masks
+        fill_mask, outline_mask = _heart_masks(half_size)
+        draw.bitmap((x-half_size, y-half_size), fill_mask, fill=color)
+        draw.bitmap((x-half_size, y-half_size), outline_mask, fill=OUTLINE_COLOR)
+    
+    def _draw_cross(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a cross."""
+        # Cross shape
+        thickness = half_size // 4
+        # Vertical bar
+        draw.rectangle([x-thickness, y-half_size, x+thickness, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+        # Horizontal bar
+        draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_arrow_shape(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a right-pointing arrow shape."""
+        # Arrow pointing right
+        points = [
+            (x-half_size, y-half_size//2),  # left top
+            (x, y-half_size//2),            # middle top
+            (x, y-half_size),               # tip top
+            (x+half_size, y),               # tip point
+            (x, y+half_size),               # tip bottom
+            (x, y+half_size//2),            # middle bottom
+            (x-half_size, y+half_size//2)   # left bottom
+        ]
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_trapezoid(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a trapezoid."""
+        # Trapezoid (wider at bottom)
+        top_width = half_size // 2
+        points = [
+            (x-top_width, y-half_size),     # top left
+            (x+top_width, y-half_size),     # top right
+            (x+half_size, y+half_size),     # bottom right
+            (x-half_size, y+half_size)      # bottom left
+        ]
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_rhombus(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a rhombus."""
+        # Rhombus (diamond rotated)
+        points = [
+            (x, y-half_size),               # top
+            (x+half_size*0.7, y),           # right
+            (x, y+half_size),               # bottom
+            (x-half_size*0.7, y)            # left
+        ]
+        draw.polygon(points, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_crescent(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a crescent."""
+        # Crescent moon shape (larger circle minus an offset smaller one),
+        # stamped through cached masks so the background shows through
+        fill_mask, outline_mask = _crescent_masks(half_size)
+        draw.bitmap((x-half_size, y-half_size), fill_mask, fill=color)
+        draw.bitmap((x-half_size, y-half_size), outline_mask, fill=OUTLINE_COLOR)
+    
+    def _draw_plus(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a plus sign."""
+        # Plus sign (thicker cross)
+        thickness = half_size // 3
+        # Vertical bar
+        draw.rectangle([x-thickness, y-half_size, x+thickness, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+        # Horizontal bar
+        draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_minus(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a minus sign."""
+        # Minus sign (horizontal bar)
+        thickness = half_size // 4
+        draw.rectangle([x-half_size, y-thickness, x+half_size, y+thickness], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_l_shape(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw an L shape."""
+        # L shape
+        thickness = half_size // 3
+        # Vertical part
+        draw.rectangle([x-half_size, y-half_size, x-half_size+thickness, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+        # Horizontal part
+        draw.rectangle([x-half_size, y+half_size-thickness, x+half_size, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+    
+    def _draw_t_shape(self, draw: ImageDraw.Draw, x: int, y: int, half_size: int, color: Tuple[int, int, int]):
+        """Draw a T shape."""
+        # T shape
+        thickness = half_size // 3
+        # Horizontal top part
+        draw.rectangle([x-half_size, y-half_size, x+half_size, y-half_size+thickness], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
+        # Vertical part
+        draw.rectangle([x-thickness//2, y-half_size, x+thickness//2, y+half_size], fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
     
     def _draw_rounded_shape(self, draw: ImageDraw.Draw, shape: str, x: int, y: int, size: int, color: Tuple[int, int, int]):
         """Draw a rounded version of a shape."""
@@ -497,61 +601,43 @@ class TaskGenerator(BaseGenerator):
     
     def _draw_rounded_rectangle(self, draw: ImageDraw.Draw, x1: int, y1: int, x2: int, y2: int, radius: int, color: Tuple[int, int, int]):
         """Draw a rounded rectangle."""
-        # Main rectangle
-        draw.rectangle([x1+radius, y1, x2-radius, y2], fill=color)
-        draw.rectangle([x1, y1+radius, x2, y2-radius], fill=color)
-        
-        # Corner circles
-        draw.ellipse([x1, y1, x1+2*radius, y1+2*radius], fill=color)  # top-left
-        draw.ellipse([x2-2*radius, y1, x2, y1+2*radius], fill=color)  # top-right
-        draw.ellipse([x1, y2-2*radius, x1+2*radius, y2], fill=color)  # bottom-left
-        draw.ellipse([x2-2*radius, y2-2*radius, x2, y2], fill=color)  # bottom-right
-        
-        # Outline
-        draw.arc([x1, y1, x1+2*radius, y1+2*radius], 180, 270, fill=(0,0,0), width=2)
-        draw.arc([x2-2*radius, y1, x2, y1+2*radius], 270, 360, fill=(0,0,0), width=2)
-        draw.arc([x1, y2-2*radius, x1+2*radius, y2], 90, 180, fill=(0,0,0), width=2)
-        draw.arc([x2-2*radius, y2-2*radius, x2, y2], 0, 90, fill=(0,0,0), width=2)
-        draw.line([x1+radius, y1, x2-radius, y1], fill=(0,0,0), width=2)
-        draw.line([x1+radius, y2, x2-radius, y2], fill=(0,0,0), width=2)
-        draw.line([x1, y1+radius, x1, y2-radius], fill=(0,0,0), width=2)
-        draw.line([x2, y1+radius, x2, y2-radius], fill=(0,0,0), width=2)
+        draw.rounded_rectangle([x1, y1, x2, y2], radius=radius, fill=color, outline=OUTLINE_COLOR, width=OUTLINE_WIDTH)
     
     def _draw_arrow(self, draw: ImageDraw.Draw, position: Tuple[int, int]):
         """Draw a right-pointing arrow."""
         x, y = position
-        length = self.config.arrow_length
+        start, end = self._arrow_shaft
         
         # Arrow shaft
-        draw.line([x-length//2, y, x+length//2-10, y], fill=(0,0,0), width=3)
+        draw.line([x+start, y, x+end, y], fill=(0,0,0), width=3)
         
         # Arrow head
-        points = [
-            (x+length//2, y),
-            (x+length//2-15, y-8),
-            (x+length//2-15, y+8)
-        ]
-        draw.polygon(points, fill=(0,0,0))
+        draw.polygon([(x+px, y+py) for px, py in self._arrow_head], fill=(0,0,0))
     
     def _draw_question_mark(self, draw: ImageDraw.Draw, position: Tuple[int, int]):
         """Draw a question mark."""
         x, y = position
-        size = self.config.question_mark_size
-        
-        try:
-            font = ImageFont.truetype("arial.ttf", size)
-        except:
-            font = ImageFont.load_default()
-        
-        # Get text bounds for centering
-        bbox = draw.textbbox((0, 0), "?", font=font)
-        w = bbox[2] - bbox[0]
-        h = bbox[3] - bbox[1]
         
-        text_x = x - w // 2
-        text_y = y - h // 2
+        # Rasterize the glyph once per generator; later draws just stamp it
+        if self._question_mark_glyph is None:
+            try:
+                font = ImageFont.truetype("arial.ttf", self.config.question_mark_size)
+            except OSError:
+                font = ImageFont.load_default()
+            
+            # Get text bounds for centering
+            bbox = draw.textbbox((0, 0), "?", font=font)
+            w = bbox[2] - bbox[0]
+            h = bbox[3] - bbox[1]
+            
+            glyph = Image.new("L", (w, h), 0)
+            ImageDraw.Draw(glyph).text((-bbox[0], -bbox[1]), "?", font=font, fill=255)
+            
+            self._question_mark_glyph = glyph
+            self._question_mark_offset = (w // 2 - bbox[0], h // 2 - bbox[1])
         
-        draw.text((text_x, text_y), "?", font=font, fill=(100, 100, 100))
+        offset_x, offset_y = self._question_mark_offset
+        draw.bitmap((x - offset_x, y - offset_y), self._question_mark_glyph, fill=(100, 100, 100))
     
     # ══════════════════════════════════════════════════════════════════════════
     #  VIDEO GENERATION
@@ -559,44 +645,36 @@ class TaskGenerator(BaseGenerator):
     
     def _generate_video(self, first_image: Image.Image, final_image: Image.Image, task_id: str, task_data: Dict[str, Any]) -> str:
         """Generate ground truth video showing the transformation."""
-        temp_dir = Path(tempfile.gettempdir()) / f"{self.config.domain}_videos"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        video_path = temp_dir / f"{task_id}_ground_truth.mp4"
+        video_path = self.video_dir / f"{task_id}_ground_truth.mp4"
         
-        # Create animation frames
+        # Stream animation frames straight into the encoder
         frames = self._create_transformation_frames(first_image, final_image, task_data)
         
         result = self.video_generator.create_video_from_frames(frames, video_path)
         return str(result) if result else None
     
-    def _create_transformation_frames(self, first_image: Image.Image, final_image: Image.Image, task_data: Dict[str, Any], hold_frames: int = 15, scale_frames: int = 30) -> List[Image.Image]:
-        """Create animation frames showing the scaling transformation."""
-        frames = []
-        
-        # Hold initial state
+    def _create_transformation_frames(self, first_image: Image.Image, final_image: Image.Image, task_data: Dict[str, Any], hold_frames: int = 15, scale_frames: int = 30) -> Iterator[Image.Image]:
+        """Yield animation frames showing the scaling transformation."""
+        # Hold initial state; the video encoder only reads frames, so the
+        # same image is shared (and converted once) instead of copied
         for _ in range(hold_frames):
-            frames.append(first_image.copy())
+            yield first_image
         
         # Create scaling animation showing the shape gradually changing size
-        frames.extend(self._create_scaling_morph_frames(task_data, scale_frames))
+        yield from self._create_scaling_morph_frames(task_data, scale_frames)
         
         # Hold final state
         for _ in range(hold_frames):
-            frames.append(final_image.copy())
-        
-        return frames
+            yield final_image
     
-    def _create_scaling_morph_frames(self, task_data: Dict[str, Any], num_frames: int) -> List[Image.Image]:
-        """Create frames showing the shape gradually changing size."""
-        frames = []
+    def _create_scaling_morph_frames(self, task_data: Dict[str, Any], num_frames: int) -> Iterator[Image.Image]:
+        """Yield frames showing the shape gradually changing size."""
         
-        width, height = self.config.image_size
-        margin = self.config.margin
         shape_size = self.config.shape_size
+        positions = self.positions
         
         # Position of the shape that's being transformed (bottom right - the answer position)
-        answer_x = width - margin - shape_size//2
-        answer_y = 3*height//4
+        answer_x, answer_y = positions["D"]
         
         shape_c = task_data["shape_c"]
         scale_factor = task_data["scale_factor"]
@@ -606,37 +684,30 @@ class TaskGenerator(BaseGenerator):
         target_size = int(shape_size * scale_factor)  # This is the final scaled size
         
         # Ensure target size fits within bounds
-        max_allowed_size = self._get_max_shape_size_for_position(answer_x, answer_y)
+        max_allowed_size = self._max_size_at[positions["D"]]
         target_size = min(target_size, max_allowed_size)
         
-        for i in range(num_frames):
-            # Create frame with static elements
-            img = self.renderer.create_blank_image()
-            draw = ImageDraw.Draw(img)
-            
-            # Draw static elements (A, arrow, B, C, arrow)
-            positions = {
-                "A": (margin + shape_size//2, height//4),
-                "arrow1": (width//2, height//4),
-                "B": (width - margin - shape_size//2, height//4),
-                "C": (margin + shape_size//2, 3*height//4),
-                "arrow2": (width//2, 3*height//4),
-            }
-            
-            # Draw static shapes
-            self._draw_shape_at_position(draw, task_data["shape_a"], positions["A"], shape_size, task_data)
-            self._draw_arrow(draw, positions["arrow1"])
-            self._draw_transformed_shape_at_position(draw, task_data["shape_b"], positions["B"], shape_size, task_data, "B")
-            self._draw_shape_at_position(draw, task_data["shape_c"], positions["C"], shape_size, task_data)
-            self._draw_arrow(draw, positions["arrow2"])
+        # Static elements (A, arrow, B, C, arrow) are identical in every
+        # frame, so take the task's layout once and copy it per frame
+        static_bg = self._render_layout(task_data)
+        
+        # Size schedule interpolating between original_size and target_size,
+        # computed for all frames at once (truncated like int() per frame)
+        if num_frames > 1:
+            progress = np.arange(num_frames) / (num_frames - 1)
+        else:
+            progress = np.ones(num_frames)
+        sizes = (original_size + (target_size - original_size) * progress).astype(np.int32).tolist()
+        
+        # Resolve the shape's drawing method once instead of per frame
+        draw_shape = self._shape_handlers.get(shape_c)
+        color = self.shape_color
+        
+        for current_size in sizes:
+            img = static_bg.copy()
             
             # Draw scaling shape at answer position
-            # Interpolate between original_size and target_size
-            scale_progress = i / (num_frames - 1) if num_frames > 1 else 1.0
-            current_size = int(original_size + (target_size - original_size) * scale_progress)
+            if draw_shape is not None:
+                draw_shape(ImageDraw.Draw(img), answer_x, answer_y, current_size // 2, color)
             
-            self._draw_base_shape(draw, shape_c, answer_x, answer_y, current_size, self.shape_color)
-            
-            frames.append(img)
-        
-        return frames
+            yield img
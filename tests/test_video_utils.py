@@ -0,0 +1,79 @@
+"""Tests for the ffmpeg backend of VideoGenerator."""
+
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from core.video_utils import CV2_AVAILABLE, VideoGenerator
+
+
+# Stands in for ffmpeg: records its PID, then copies stdin to the output path
+STUB_FFMPEG = textwrap.dedent("""\
+    #!{python}
+    import os, sys
+    pid_file = os.environ["STUB_FFMPEG_PID"]
+    with open(pid_file + ".tmp", "w") as f:
+        f.write(str(os.getpid()))
+    os.replace(pid_file + ".tmp", pid_file)
+    with open(sys.argv[-1], "wb") as out:
+        while True:
+            chunk = sys.stdin.buffer.read(1 << 16)
+            if not chunk:
+                break
+            out.write(chunk)
+""")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether pid is still a running (not reaped) process."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@unittest.skipUnless(CV2_AVAILABLE, "opencv-python not installed")
+class FfmpegBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        stub = self.tmp / "ffmpeg"
+        stub.write_text(STUB_FFMPEG.format(python=sys.executable))
+        stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+        self.pid_file = self.tmp / "ffmpeg.pid"
+        env = {
+            "PATH": f"{self.tmp}{os.pathsep}{os.environ.get('PATH', '')}",
+            "STUB_FFMPEG_PID": str(self.pid_file),
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failing_frame_source_stops_ffmpeg_and_removes_output(self):
+        def frames():
+            for _ in range(3):
+                yield Image.new("RGB", (64, 64), (255, 0, 0))
+            while not self.pid_file.exists():
+                time.sleep(0.01)
+            raise ValueError("frame rendering failed")
+
+        generator = VideoGenerator(backend="ffmpeg")
+        output_path = self.tmp / "video.mp4"
+        with self.assertRaises(ValueError):
+            generator.create_video_from_frames(frames(), output_path)
+
+        self.assertFalse(_pid_alive(int(self.pid_file.read_text())))
+        self.assertFalse(output_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()